@@ -14,12 +14,18 @@
 
 from __future__ import annotations
 
+import io
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from sudachipy import Dictionary
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_JSON = OUTPUT_DIR / "reading_candidates_diagnostics.json"
@@ -137,124 +143,142 @@ CASES: list[dict[str, Any]] = [
 ]
 
 
-def _token_dict(m: Any) -> dict[str, Any]:
-    pos = list(m.part_of_speech())
-    return {
-        "surface": m.surface(),
-        "reading_form": m.reading_form(),
-        "pos": pos,
-        "lex_id": m.lex_id(),
-        "word_id": m.word_id(),
-    }
+class Token(NamedTuple):
+    surface: str
+    reading_form: str
+    pos: tuple[str, ...]
+    lex_id: int
+    word_id: int
+
+
+def _token(m: Any) -> Token:
+    # part_of_speech() already returns the dictionary's shared POS tuple
+    return Token(m.surface(), m.reading_form(), m.part_of_speech(), m.lex_id(), m.word_id())
+
+
+POS_SYMBOL = "補助記号"
+POS_NOUN = "名詞"
+POS_NUMERAL = "数詞"
 
 
-def _concat_reading(tokens: list[dict[str, Any]]) -> str:
-    return "".join(t["reading_form"] for t in tokens)
+def _concat_all(tokens: list[Token]) -> tuple[str, str, str]:
+    """Build the reading-form, symbol-surface and symbol+number-surface
+    concatenations in a single pass over ``tokens``."""
+    reading: list[str] = []
+    symbol: list[str] = []
+    symbol_number: list[str] = []
+    for surface, reading_form, pos, _, _ in tokens:
+        is_symbol = pos[0] == POS_SYMBOL
+        is_number = not is_symbol and pos[0] == POS_NOUN and pos[1] == POS_NUMERAL
+        reading.append(reading_form)
+        symbol.append(surface if is_symbol else reading_form)
+        symbol_number.append(surface if is_symbol or is_number else reading_form)
+    return "".join(reading), "".join(symbol), "".join(symbol_number)
 
 
-def _concat_symbol_surface(tokens: list[dict[str, Any]]) -> str:
-    parts: list[str] = []
-    for t in tokens:
-        if t["pos"][0] == "補助記号":
-            parts.append(t["surface"])
-        else:
-            parts.append(t["reading_form"])
-    return "".join(parts)
+_DICT: Dictionary | None = None
 
 
-def _concat_symbol_number_surface(tokens: list[dict[str, Any]]) -> str:
-    parts: list[str] = []
-    for t in tokens:
-        is_symbol = t["pos"][0] == "補助記号"
-        is_number = t["pos"][0] == "名詞" and t["pos"][1] == "数詞"
-        if is_symbol or is_number:
-            parts.append(t["surface"])
-        else:
-            parts.append(t["reading_form"])
-    return "".join(parts)
+def _get_dict() -> Dictionary:
+    global _DICT
+    if _DICT is None:
+        _DICT = Dictionary()
+    return _DICT
 
 
 def build_report() -> dict[str, Any]:
-    d = Dictionary()
-    tok = d.create()
+    tok = _get_dict().create()
     rows: list[dict[str, Any]] = []
-    try:
-        for case in CASES:
-            text = case["text"]
-            reading = case["reading"]
-            min_tokens = int(case.get("min_tokens", 1))
-
-            tokenized = [_token_dict(m) for m in tok.tokenize(text)]
-            candidates = tok.tokenize_reading_candidates(
-                text, reading, max_results=25, min_tokens=min_tokens
-            )
-            expected_min = int(case.get("expected_min", 1))
-            status = "ok" if len(candidates) >= expected_min else "needs_fix"
-
-            row = {
-                **case,
-                "tokenized": tokenized,
-                "derived_reading_form_concat": _concat_reading(tokenized),
-                "derived_symbol_surface_concat": _concat_symbol_surface(tokenized),
-                "derived_symbol_number_surface_concat": _concat_symbol_number_surface(tokenized),
-                "min_tokens": min_tokens,
-                "expected_min": expected_min,
-                "status": status,
-                "candidate_count": len(candidates),
-                "top_candidates": candidates[:5],
+    # Several cases share the same text; tokenize each distinct text once.
+    derived_cache: dict[str, dict[str, Any]] = {}
+    for case in CASES:
+        text = case["text"]
+        reading = case["reading"]
+        min_tokens = int(case.get("min_tokens", 1))
+
+        derived = derived_cache.get(text)
+        if derived is None:
+            tokens = [_token(m) for m in tok.tokenize(text)]
+            reading_concat, symbol_concat, symbol_number_concat = _concat_all(tokens)
+            derived = derived_cache[text] = {
+                "tokenized": [t._asdict() for t in tokens],
+                "derived_reading_form_concat": reading_concat,
+                "derived_symbol_surface_concat": symbol_concat,
+                "derived_symbol_number_surface_concat": symbol_number_concat,
             }
-            rows.append(row)
-    finally:
-        d.close()
+        candidates = tok.tokenize_reading_candidates(
+            text, reading, max_results=25, min_tokens=min_tokens
+        )
+        expected_min = int(case.get("expected_min", 1))
+        status = "ok" if len(candidates) >= expected_min else "needs_fix"
+
+        row = {
+            **case,
+            **derived,
+            "min_tokens": min_tokens,
+            "expected_min": expected_min,
+            "status": status,
+            "candidate_count": len(candidates),
+            "top_candidates": candidates[:5],
+            "top_candidate_surfaces_joined": " / ".join(
+                "+".join(t["surface"] for t in c["tokens"]) for c in candidates[:3]
+            ) or "(none)",
+        }
+        rows.append(row)
 
     return {"cases": rows}
 
 
+CASE_TEMPLATE = """\
+## {id}
+
+- note: {note}
+- text: `{text}`
+- reading: `{reading}`
+- min_tokens: {min_tokens}
+- derived_reading_form_concat: `{derived_reading_form_concat}`
+- derived_symbol_surface_concat: `{derived_symbol_surface_concat}`
+- derived_symbol_number_surface_concat: `{derived_symbol_number_surface_concat}`
+- expected_min: {expected_min}
+- candidate_count: {candidate_count}
+- status: {status}
+- top_candidate_surfaces: {top_candidate_surfaces_joined}
+
+"""
+
+
 def write_markdown(report: dict[str, Any]) -> str:
-    lines: list[str] = []
-    lines.append("# Reading Candidates Diagnostics")
-    lines.append("")
-    lines.append("| Case | Candidate Count | Text | Reading |")
-    lines.append("|---|---:|---|---|")
+    buf = io.StringIO()
+    buf.write("# Reading Candidates Diagnostics\n")
+    buf.write("\n")
+    buf.write("| Case | Candidate Count | Text | Reading |\n")
+    buf.write("|---|---:|---|---|\n")
     for row in report["cases"]:
-        lines.append(
-            f"| {row['id']} | {row['candidate_count']} | {row['text']} | {row['reading']} |"
+        buf.write(
+            f"| {row['id']} | {row['candidate_count']} | {row['text']} | {row['reading']} |\n"
         )
-    lines.append("")
+    buf.write("\n")
 
     for row in report["cases"]:
-        lines.append(f"## {row['id']}")
-        lines.append("")
-        lines.append(f"- note: {row['note']}")
-        lines.append(f"- text: `{row['text']}`")
-        lines.append(f"- reading: `{row['reading']}`")
-        lines.append(f"- min_tokens: {row['min_tokens']}")
-        lines.append(f"- derived_reading_form_concat: `{row['derived_reading_form_concat']}`")
-        lines.append(f"- derived_symbol_surface_concat: `{row['derived_symbol_surface_concat']}`")
-        lines.append(
-            f"- derived_symbol_number_surface_concat: `{row['derived_symbol_number_surface_concat']}`"
-        )
-        lines.append(f"- expected_min: {row['expected_min']}")
-        lines.append(f"- candidate_count: {row['candidate_count']}")
-        lines.append(f"- status: {row['status']}")
-        if row["top_candidates"]:
-            lines.append("- top_candidate_surfaces: " + " / ".join(
-                ["+".join(t["surface"] for t in c["tokens"]) for c in row["top_candidates"][:3]]
-            ))
-        else:
-            lines.append("- top_candidate_surfaces: (none)")
-        lines.append("")
+        buf.write(CASE_TEMPLATE.format(**row))
 
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
+
+
+def write_json(report: dict[str, Any]) -> None:
+    if orjson is not None:
+        OUTPUT_JSON.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        OUTPUT_JSON.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
 
 
 def main() -> int:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     report = build_report()
-    OUTPUT_JSON.write_text(
-        json.dumps(report, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(report)
     OUTPUT_MD.write_text(write_markdown(report), encoding="utf-8")
     print(f"Wrote: {OUTPUT_JSON}")
     print(f"Wrote: {OUTPUT_MD}")
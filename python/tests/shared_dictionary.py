@@ -0,0 +1,45 @@
+# Copyright (c) 2026 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of dictionaries shared between test modules.
+
+Dictionaries returned from here are owned by the cache and closed at
+interpreter exit; tests must not call ``close()`` on them. Entries are keyed
+by pid as well, so forked test workers load their own copies.
+"""
+
+import atexit
+import os
+
+from sudachipy import Dictionary
+
+
+_DICT_CACHE: dict = {}
+
+
+def get_dictionary(config_path=None, resource_dir=None) -> Dictionary:
+    key = (os.getpid(), config_path, resource_dir)
+    dict_ = _DICT_CACHE.get(key)
+    if dict_ is None:
+        dict_ = _DICT_CACHE[key] = Dictionary(config_path, resource_dir=resource_dir)
+    return dict_
+
+
+@atexit.register
+def _close_all():
+    pid = os.getpid()
+    for (owner, _, _), dict_ in _DICT_CACHE.items():
+        if owner == pid:
+            dict_.close()
+    _DICT_CACHE.clear()
@@ -12,6 +12,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import hashlib
+import os
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -33,23 +36,82 @@ CFG_TEMPLATE = Config(
 )
 
 
+def _dic_cache_dir() -> Path:
+    # Per-user directory, so other users cannot pre-seed a cached dictionary.
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sudachipy-tests"
+
+
+def _dic_cache_path(matrix: Path, lex: list[Path]) -> Path:
+    # The build output is deterministic for the same inputs and builder, so
+    # key the cached dictionary by input contents and the compiled extension.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(sudachipy.__version__.encode())
+    ext = Path(sudachipy.sudachipy.__file__).stat()
+    h.update(f"{ext.st_size}:{ext.st_mtime_ns}".encode())
+    h.update(matrix.read_bytes())
+    for p in lex:
+        h.update(p.read_bytes())
+    return _dic_cache_dir() / f"sudachi_sys_{h.hexdigest()}.dic"
+
+
 class MyTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The system dictionary is identical for every test and treated as
+        # read-only, so build it once; only user dictionaries are per-test.
+        # It is also cached across runs unless SUDACHI_TEST_NOCACHE=1.
+        super().setUpClass()
+        matrix = RESOURCES_PATH / "matrix.def"
+        lex = [RESOURCES_PATH / "lex.csv"]
+        cls._build_dir = None
+        # The builder refuses to overwrite an existing file, so build into a
+        # fresh private directory rather than a pre-created temp file.
+        target = build_dir = None
+        if os.environ.get("SUDACHI_TEST_NOCACHE") != "1":
+            try:
+                target = _dic_cache_path(matrix, lex)
+                target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+                if not target.exists():
+                    # build next to the target and rename, so a concurrent
+                    # run never sees a partially written dictionary
+                    build_dir = tempfile.mkdtemp(prefix="sudachi_sy", dir=target.parent)
+            except (OSError, RuntimeError):
+                # no usable home or cache directory: build without caching
+                target = None
+        if target is None:
+            cls._build_dir = tempfile.mkdtemp(prefix="sudachi_sy")
+            cls._shared_sys_dic = os.path.join(cls._build_dir, "system.dic")
+            sudachipy.sudachipy.build_system_dic(matrix=matrix, lex=lex, output=cls._shared_sys_dic)
+            return
+
+        cls._shared_sys_dic = str(target)
+        if build_dir is None:
+            return
+        try:
+            tmp = os.path.join(build_dir, "system.dic")
+            sudachipy.sudachipy.build_system_dic(matrix=matrix, lex=lex, output=tmp)
+            os.replace(tmp, target)
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls._build_dir is not None:
+            shutil.rmtree(cls._build_dir, ignore_errors=True)
+        super().tearDownClass()
+
     def setUp(self) -> None:
-        self.tempfiles = []
-        self.tmpdir = tempfile.mkdtemp("sudachi", "test")
+        self._tmpctx = tempfile.TemporaryDirectory(prefix="sudachi_test_")
+        self.tmpdir = self._tmpctx.name
         super().setUp()
 
     def tearDown(self) -> None:
-        for f in self.tempfiles:
-            p = Path(f)
-            if p.exists():
-                p.unlink()
-        Path(self.tmpdir).rmdir()
+        self._tmpctx.cleanup()
         super().tearDown()
 
     def test_build_system(self):
-        out_tmp = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(out_tmp)
+        out_tmp = os.path.join(self.tmpdir, "sudachi_sy.dic")
         stats = sudachipy.sudachipy.build_system_dic(
             matrix=RESOURCES_PATH / "matrix.def",
             lex=[RESOURCES_PATH / "lex.csv"],
@@ -63,15 +125,8 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(result.size(), 3)
 
     def test_build_user1(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
-        u1_dic = tempfile.mktemp(prefix="sudachi_u1", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u1_dic)
+        sys_dic = self._shared_sys_dic
+        u1_dic = os.path.join(self.tmpdir, "sudachi_u1.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[RESOURCES_PATH / "user1.csv"],
@@ -86,13 +141,7 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(result[0].lex_id(), 1)
 
     def test_build_user_bytes(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         stats, u1_dic_bytes = sudachipy.sudachipy.build_user_dic_bytes(
             system=sys_dic,
@@ -109,13 +158,7 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(result[0].lex_id(), 1)
 
     def test_build_user_bytes_from_lex_bytes(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user1_bytes = (RESOURCES_PATH / "user1.csv").read_bytes()
         stats, u1_dic_bytes = sudachipy.sudachipy.build_user_dic_bytes(
@@ -132,23 +175,15 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(result[0].lex_id(), 1)
 
     def test_build_user2(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
-        u1_dic = tempfile.mktemp(prefix="sudachi_u1", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u1_dic)
+        sys_dic = self._shared_sys_dic
+        u1_dic = os.path.join(self.tmpdir, "sudachi_u1.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[RESOURCES_PATH / "user1.csv"],
             output=u1_dic
         )
 
-        u2_dic = tempfile.mktemp(prefix="sudachi_u2", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u2_dic)
+        u2_dic = os.path.join(self.tmpdir, "sudachi_u2.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[RESOURCES_PATH / "user2.csv"],
@@ -183,13 +218,7 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(split_wi.lex_id, 1)
 
     def test_user_dictionary_form_reference(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user_csv = Path(self.tmpdir) / "user_dic_form.csv"
         user_csv.write_text(
@@ -199,10 +228,8 @@ class MyTestCase(unittest.TestCase):
             ]) + "\n",
             encoding="utf-8",
         )
-        self.tempfiles.append(str(user_csv))
 
-        u1_dic = tempfile.mktemp(prefix="sudachi_u1", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u1_dic)
+        u1_dic = os.path.join(self.tmpdir, "sudachi_u1.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[user_csv],
@@ -219,23 +246,15 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(wi.dictionary_form_lex_id, 1)
 
     def test_user_dictionary_form_reference_legacy_cross_lex_id(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user_csv = Path(self.tmpdir) / "user_dic_form_legacy.csv"
         user_csv.write_text(
             "テスト語,6,6,1000,テスト語,名詞,普通名詞,一般,*,*,*,テストゴ,テスト語,200000002,A,*,*,*,*\n",
             encoding="utf-8",
         )
-        self.tempfiles.append(str(user_csv))
 
-        u1_dic = tempfile.mktemp(prefix="sudachi_u1", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u1_dic)
+        u1_dic = os.path.join(self.tmpdir, "sudachi_u1.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[user_csv],
@@ -251,23 +270,15 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(wi.dictionary_form_lex_id, -1)
 
     def test_user_dictionary_form_reference_minus_one(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user_csv = Path(self.tmpdir) / "user_dic_form_minus_one.csv"
         user_csv.write_text(
             "テスト動詞,6,6,1000,テスト動詞,動詞,一般,*,*,五段-カ行,終止形-一般,テストドウシ,テスト動詞,-1,A,*,*,*,*\n",
             encoding="utf-8",
         )
-        self.tempfiles.append(str(user_csv))
 
-        u1_dic = tempfile.mktemp(prefix="sudachi_u1", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(u1_dic)
+        u1_dic = os.path.join(self.tmpdir, "sudachi_u1.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[user_csv],
@@ -285,13 +296,7 @@ class MyTestCase(unittest.TestCase):
         self.assertTrue(wi.is_inflected)
 
     def test_word_info_accepts_cross_lex_zero_relative_ids_for_higher_lexes(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user_dics = []
         for idx, surface in enumerate(("第一語", "第二語", "第三語"), start=1):
@@ -300,10 +305,8 @@ class MyTestCase(unittest.TestCase):
                 f"{surface},6,6,1000,{surface},名詞,普通名詞,一般,*,*,*,{surface},{surface},*,A,*,*,*,*\n",
                 encoding="utf-8",
             )
-            self.tempfiles.append(str(user_csv))
 
-            user_dic = tempfile.mktemp(prefix=f"sudachi_u{idx}", suffix=".dic", dir=self.tmpdir)
-            self.tempfiles.append(user_dic)
+            user_dic = os.path.join(self.tmpdir, f"sudachi_u{idx}.dic")
             sudachipy.sudachipy.build_user_dic(
                 system=sys_dic,
                 lex=[user_csv],
@@ -321,13 +324,7 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual("第三語", wi.surface)
 
     def test_word_info_exposes_expected_ids_for_lex_3_row_500(self):
-        sys_dic = tempfile.mktemp(prefix="sudachi_sy", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(sys_dic)
-        sudachipy.sudachipy.build_system_dic(
-            matrix=RESOURCES_PATH / "matrix.def",
-            lex=[RESOURCES_PATH / "lex.csv"],
-            output=sys_dic
-        )
+        sys_dic = self._shared_sys_dic
 
         user_dics = []
         for idx, surface in enumerate(("第一語", "第二語"), start=1):
@@ -336,10 +333,8 @@ class MyTestCase(unittest.TestCase):
                 f"{surface},6,6,1000,{surface},名詞,普通名詞,一般,*,*,*,{surface},{surface},*,A,*,*,*,*\n",
                 encoding="utf-8",
             )
-            self.tempfiles.append(str(user_csv))
 
-            user_dic = tempfile.mktemp(prefix=f"sudachi_fixed_u{idx}", suffix=".dic", dir=self.tmpdir)
-            self.tempfiles.append(user_dic)
+            user_dic = os.path.join(self.tmpdir, f"sudachi_fixed_u{idx}.dic")
             sudachipy.sudachipy.build_user_dic(
                 system=sys_dic,
                 lex=[user_csv],
@@ -356,10 +351,8 @@ class MyTestCase(unittest.TestCase):
             )
         user3_csv = Path(self.tmpdir) / "user_lex3_500.csv"
         user3_csv.write_text("\n".join(lex3_rows) + "\n", encoding="utf-8")
-        self.tempfiles.append(str(user3_csv))
 
-        user3_dic = tempfile.mktemp(prefix="sudachi_u3_many", suffix=".dic", dir=self.tmpdir)
-        self.tempfiles.append(user3_dic)
+        user3_dic = os.path.join(self.tmpdir, "sudachi_u3_many.dic")
         sudachipy.sudachipy.build_user_dic(
             system=sys_dic,
             lex=[user3_csv],
@@ -15,20 +15,55 @@
 import os
 import unittest
 
-from sudachipy import Dictionary
+try:
+    from .shared_dictionary import get_dictionary
+except ImportError:  # run directly as a script, e.g. python tests/test_x.py
+    from shared_dictionary import get_dictionary
 
 
-class TestReadingCandidates(unittest.TestCase):
-    def setUp(self):
-        resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
-        self.dict_ = Dictionary(os.path.join(resource_dir, "sudachi.json"), resource_dir=resource_dir)
-        self.tokenizer_obj = self.dict_.create()
-        self.default_dict_ = Dictionary()
-        self.default_tokenizer_obj = self.default_dict_.create()
+RESOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+
+
+def _get_dicts():
+    dict_ = get_dictionary(os.path.join(RESOURCE_DIR, "sudachi.json"), RESOURCE_DIR)
+    default_dict_ = get_dictionary()
+    return dict_, dict_.create(), default_dict_, default_dict_.create()
+
+
+_SLASH_CASES = ("A/B", "a/b", "aキゴウb", "ａ／ｂ")
+_SURFACE_VARIANT_CASES = (
+    ("東京都", "とうきょうと"),
+    ("第3話", "ダイ3ワ"),
+    ("第3話", "ダイサンワ"),
+)
+
+
+MAX_RESULTS = 16
 
-    def tearDown(self):
-        self.dict_.close()
-        self.default_dict_.close()
+
+class TestReadingCandidates(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        (
+            cls.dict_,
+            cls.tokenizer_obj,
+            cls.default_dict_,
+            cls.default_tokenizer_obj,
+        ) = _get_dicts()
+        # tokenize_reading_candidates is pure for a given dictionary, so
+        # identical calls across tests are served from here; tests only read
+        # the results. It is created with the tokenizers it is keyed on, so
+        # ids of tokenizers from an earlier setUpClass can never be hit.
+        cls._CAND_CACHE = {}
+
+    def _cands(self, tok, text: str, reading: str, max_results: int = MAX_RESULTS, min_tokens: int = 1):
+        key = (id(tok), text, reading, max_results, min_tokens)
+        cands = self._CAND_CACHE.get(key)
+        if cands is None:
+            cands = self._CAND_CACHE[key] = tok.tokenize_reading_candidates(
+                text, reading, max_results=max_results, min_tokens=min_tokens
+            )
+        return cands
 
     def _assert_candidate_covers_text(self, text: str, cand: dict):
         tokens = cand["tokens"]
@@ -44,13 +79,16 @@ class TestReadingCandidates(unittest.TestCase):
         self.assertEqual(len(text), prev_end)
 
     def test_sorted_candidates_and_alternative_segmentation(self):
-        cands = self.tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16
-        )
+        cands = self._cands(self.tokenizer_obj, "東京都", "トウキョウト")
         self.assertGreaterEqual(len(cands), 1)
         self.assertEqual(["東京都"], [t["surface"] for t in cands[0]["tokens"]])
 
-        has_split = any([t["surface"] for t in c["tokens"]] == ["東京", "都"] for c in cands)
+        has_split = any(
+            len(c["tokens"]) == 2
+            and c["tokens"][0]["surface"] == "東京"
+            and c["tokens"][1]["surface"] == "都"
+            for c in cands
+        )
         self.assertTrue(has_split)
 
         costs = [c["total_cost"] for c in cands]
@@ -58,76 +96,52 @@ class TestReadingCandidates(unittest.TestCase):
 
     def test_candidate_token_spans_cover_input(self):
         text = "東京都。"
-        cands = self.tokenizer_obj.tokenize_reading_candidates(
-            text, "トウキョウト。", max_results=16
-        )
+        cands = self._cands(self.tokenizer_obj, text, "トウキョウト。")
         self.assertGreaterEqual(len(cands), 1)
         for c in cands:
             self._assert_candidate_covers_text(text, c)
 
     def test_no_match_and_limit(self):
-        cands = self.tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウフ", max_results=16
-        )
+        cands = self._cands(self.tokenizer_obj, "東京都", "トウキョウフ")
         self.assertEqual([], cands)
 
-        limited = self.tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=1
-        )
+        limited = self._cands(self.tokenizer_obj, "東京都", "トウキョウト", max_results=1)
         self.assertEqual(1, len(limited))
         self.assertEqual(["東京都"], [t["surface"] for t in limited[0]["tokens"]])
 
+    def _assert_has_candidate(self, tok, text: str, reading: str):
+        cands = self._cands(tok, text, reading)
+        self.assertGreaterEqual(len(cands), 1, msg=f"{text!r} / {reading!r}")
+
     def test_case_width_and_symbol_variants(self):
-        for reading in ("A/B", "a/b", "aキゴウb", "ａ／ｂ"):
-            with self.subTest(reading=reading):
-                cands = self.default_tokenizer_obj.tokenize_reading_candidates(
-                    "A/B", reading, max_results=16
-                )
-                self.assertGreaterEqual(len(cands), 1)
+        for reading in _SLASH_CASES:
+            with self.subTest(text="A/B", reading=reading):
+                self._assert_has_candidate(self.default_tokenizer_obj, "A/B", reading)
 
     def test_hiragana_and_number_surface_variants(self):
-        hira = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "とうきょうと", max_results=16
-        )
-        self.assertGreaterEqual(len(hira), 1)
-
-        number_surface = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "第3話", "ダイ3ワ", max_results=16
-        )
-        self.assertGreaterEqual(len(number_surface), 1)
-
-        number_reading = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "第3話", "ダイサンワ", max_results=16
-        )
-        self.assertGreaterEqual(len(number_reading), 1)
+        for text, reading in _SURFACE_VARIANT_CASES:
+            with self.subTest(text=text, reading=reading):
+                self._assert_has_candidate(self.default_tokenizer_obj, text, reading)
 
     def test_min_tokens_filters_single_token_candidates(self):
-        with_single = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16, min_tokens=1
-        )
+        with_single = self._cands(self.default_tokenizer_obj, "東京都", "トウキョウト", min_tokens=1)
         self.assertGreaterEqual(len(with_single), 1)
         self.assertEqual(["東京都"], [t["surface"] for t in with_single[0]["tokens"]])
 
-        no_single = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16, min_tokens=2
-        )
+        no_single = self._cands(self.default_tokenizer_obj, "東京都", "トウキョウト", min_tokens=2)
         self.assertGreaterEqual(len(no_single), 1)
         self.assertTrue(all(len(c["tokens"]) >= 2 for c in no_single))
-        self.assertTrue(all([t["surface"] for t in c["tokens"]] != ["東京都"] for c in no_single))
+        self.assertFalse(
+            any(len(c["tokens"]) == 1 and c["tokens"][0]["surface"] == "東京都" for c in no_single)
+        )
 
     def test_min_tokens_too_large_returns_empty(self):
-        no_path = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16, min_tokens=10
-        )
+        no_path = self._cands(self.default_tokenizer_obj, "東京都", "トウキョウト", min_tokens=10)
         self.assertEqual([], no_path)
 
     def test_min_tokens_zero_is_treated_as_one(self):
-        as_one = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16, min_tokens=1
-        )
-        as_zero = self.default_tokenizer_obj.tokenize_reading_candidates(
-            "東京都", "トウキョウト", max_results=16, min_tokens=0
-        )
+        as_one = self._cands(self.default_tokenizer_obj, "東京都", "トウキョウト", min_tokens=1)
+        as_zero = self._cands(self.default_tokenizer_obj, "東京都", "トウキョウト", min_tokens=0)
         self.assertEqual(as_one, as_zero)
 
 
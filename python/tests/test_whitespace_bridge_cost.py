@@ -16,39 +16,81 @@ import os
 import random
 import unittest
 
-from sudachipy import Dictionary
+try:
+    from .shared_dictionary import get_dictionary
+except ImportError:  # run directly as a script, e.g. python tests/test_x.py
+    from shared_dictionary import get_dictionary
 
 
-def _is_bridge_separator_surface(surface: str) -> bool:
-    if not surface:
-        return True
-    if surface.isspace():
-        return True
+# A bridge separator surface is empty, all whitespace, or made up only of
+# ellipsis/dot separators; translating with this table drops the latter.
+_SEPARATOR_CHARS = frozenset("…⋯.．・")
+_SEPARATOR_DROP_TABLE = str.maketrans(dict.fromkeys(_SEPARATOR_CHARS))
 
-    for ch in surface:
-        if ch in ("…", "⋯", ".", "．", "・"):
-            pass
-        else:
-            return False
-    return True
 
+# Module constants are bound as default arguments so the hot path reads
+# locals rather than globals.
+def _is_bridge_separator_surface(
+    surface: str, _isspace=str.isspace, _translate=str.translate, _table=_SEPARATOR_DROP_TABLE
+) -> bool:
+    return _isspace(surface) or not _translate(surface, _table)
 
-def _non_ws_surfaces(ms):
-    return [m.surface() for m in ms if not _is_bridge_separator_surface(m.surface())]
+
+def _surfaces(ms):
+    return [m.surface() for m in ms]
+
+
+def _non_ws_surfaces(ms, _is_separator=_is_bridge_separator_surface):
+    surfaces = (m.surface() for m in ms)
+    return [s for s in surfaces if not _is_separator(s)]
+
+
+def _uniform(seq, key=None):
+    """Checks that all items of ``seq`` are equal (by ``key`` if given).
+
+    Stops at the first mismatch and returns ``(False, mismatch, first)``;
+    returns ``(True, None, None)`` if all items are equal.
+    """
+    it = iter(seq)
+    for first in it:
+        expected = first if key is None else key(first)
+        for x in it:
+            if (x if key is None else key(x)) != expected:
+                return False, x, first
+    return True, None, None
+
+
+def _both_costs(tok, text):
+    ms = tok.tokenize(text)
+    return ms.get_internal_cost(), ms.get_internal_cost_whitespace_bridged()
 
 
 class TestWhitespaceBridgeCost(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
-        self.dict_ = Dictionary(os.path.join(resource_dir, "sudachi.json"), resource_dir)
-        self.tokenizer_obj = self.dict_.create()
+        cls.dict_ = get_dictionary(os.path.join(resource_dir, "sudachi.json"), resource_dir)
 
-    def _internal(self, text: str) -> int:
-        return self.tokenizer_obj.tokenize(text).get_internal_cost()
+    def setUp(self):
+        # Tests toggle the global whitespace bridge on the tokenizer, so each
+        # test gets its own tokenizer from the shared dictionary.
+        self.tokenizer_obj = self.dict_.create()
 
     def _bridged(self, text: str) -> int:
         return self.tokenizer_obj.tokenize(text).get_internal_cost_whitespace_bridged()
 
+    def _assert_variants_equivalent(self, variants):
+        # Tokenize each variant once, lazily, and compare its bridged score and
+        # non-whitespace surfaces with the first variant's.
+        tokenize = self.tokenizer_obj.tokenize
+
+        def summarize(text):
+            ms = tokenize(text)
+            return text, ms.get_internal_cost_whitespace_bridged(), _non_ws_surfaces(ms)
+
+        ok, mismatch, first = _uniform(map(summarize, variants), key=lambda r: r[1:])
+        self.assertTrue(ok, msg=f"{mismatch!r} vs {first!r}")
+
     def test_global_bridge_toggle_api(self):
         prev = self.tokenizer_obj.set_global_whitespace_bridge(True)
         self.assertFalse(prev)
@@ -66,15 +108,18 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
             "私は 東京 大学 へ 行く",
             "すもも も もも も ももの うち",
         ]
+
+        tok = self.tokenizer_obj
         for text in texts:
             with self.subTest(text=text):
-                self.tokenizer_obj.set_global_whitespace_bridge(False)
-                normal = self.tokenizer_obj.tokenize(text).get_internal_cost()
-                self.tokenizer_obj.set_global_whitespace_bridge(True)
-                bridged = self.tokenizer_obj.tokenize(text).get_internal_cost()
+                tok.set_global_whitespace_bridge(False)
+                normal = tok.tokenize(text).get_internal_cost()
+                tok.set_global_whitespace_bridge(True)
+                bridged = tok.tokenize(text).get_internal_cost()
                 self.assertLessEqual(bridged, normal)
 
     def test_global_bridge_does_not_change_surface_sequence(self):
+        tokenize = self.tokenizer_obj.tokenize
         texts = [
             "東京都 大学",
             "高輪 ゲートウェイ 駅",
@@ -82,39 +127,37 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
             "すもも も もも も ももの うち",
             "東京 ・ 大学",
         ]
-        for text in texts:
+        self.tokenizer_obj.set_global_whitespace_bridge(False)
+        normal = [_surfaces(tokenize(text)) for text in texts]
+        self.tokenizer_obj.set_global_whitespace_bridge(True)
+        for text, normal_surfaces in zip(texts, normal):
             with self.subTest(text=text):
-                self.tokenizer_obj.set_global_whitespace_bridge(False)
-                normal = [m.surface() for m in self.tokenizer_obj.tokenize(text)]
-                self.tokenizer_obj.set_global_whitespace_bridge(True)
-                bridged = [m.surface() for m in self.tokenizer_obj.tokenize(text)]
-                self.assertEqual(normal, bridged)
+                self.assertEqual(normal_surfaces, _surfaces(tokenize(text)))
 
     def test_no_whitespace_matches_internal_cost(self):
-        for text in [
+        texts = [
             "",
             "東京都大学",
             "高輪ゲートウェイ駅",
             "東京大学です",
             "ＡＢＣ123",
             "！？",
-        ]:
+        ]
+        for text in texts:
             with self.subTest(text=text):
-                ms = self.tokenizer_obj.tokenize(text)
-                self.assertEqual(
-                    ms.get_internal_cost(),
-                    ms.get_internal_cost_whitespace_bridged(),
-                )
+                internal, bridged = _both_costs(self.tokenizer_obj, text)
+                self.assertEqual(internal, bridged)
 
     def test_whitespace_only_is_zero(self):
-        for text in [" ", "  ", "\t", "\n", " \t\n　 "]:
+        texts = [" ", "  ", "\t", "\n", " \t\n　 "]
+        for text in texts:
             with self.subTest(text=repr(text)):
-                ms = self.tokenizer_obj.tokenize(text)
-                self.assertEqual(0, ms.get_internal_cost_whitespace_bridged())
+                _, bridged = _both_costs(self.tokenizer_obj, text)
+                self.assertEqual(0, bridged)
 
     def test_whitespace_tokens_are_kept_in_output(self):
         ms = self.tokenizer_obj.tokenize("東京 大学")
-        self.assertIn(" ", [m.surface() for m in ms])
+        self.assertIn(" ", _surfaces(ms))
         self.assertLessEqual(
             ms.get_internal_cost_whitespace_bridged(),
             ms.get_internal_cost(),
@@ -130,23 +173,20 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
             "　東京都 大学　",
             "東京都\n大学",
         ]
-        scores = [self._bridged(v) for v in variants]
-        self.assertTrue(all(s == scores[0] for s in scores), msg=str(list(zip(variants, scores))))
-
-        non_ws = [_non_ws_surfaces(self.tokenizer_obj.tokenize(v)) for v in variants]
-        self.assertTrue(all(s == non_ws[0] for s in non_ws), msg=str(list(zip(variants, non_ws))))
+        self._assert_variants_equivalent(variants)
 
     def test_bridged_cost_matches_compact_internal_when_non_ws_path_matches(self):
+        tokenize = self.tokenizer_obj.tokenize
         pairs = [
             ("東京都大学", "東京都 大学"),
             ("東京大学", "東京 大学"),
         ]
         for compact, spaced in pairs:
             with self.subTest(compact=compact, spaced=spaced):
-                compact_ms = self.tokenizer_obj.tokenize(compact)
-                spaced_ms = self.tokenizer_obj.tokenize(spaced)
+                compact_ms = tokenize(compact)
+                spaced_ms = tokenize(spaced)
                 self.assertEqual(
-                    [m.surface() for m in compact_ms],
+                    _surfaces(compact_ms),
                     _non_ws_surfaces(spaced_ms),
                 )
                 self.assertEqual(
@@ -189,11 +229,8 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
         ]
         for text in spaced_inputs:
             with self.subTest(text=text):
-                ms = self.tokenizer_obj.tokenize(text)
-                self.assertLessEqual(
-                    ms.get_internal_cost_whitespace_bridged(),
-                    ms.get_internal_cost(),
-                )
+                internal, bridged = _both_costs(self.tokenizer_obj, text)
+                self.assertLessEqual(bridged, internal)
 
     def test_ellipsis_variants_have_same_bridged_score(self):
         variants = [
@@ -204,11 +241,7 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
             "東京都⋯大学",
             "東京都．．．大学",
         ]
-        scores = [self._bridged(v) for v in variants]
-        self.assertTrue(all(s == scores[0] for s in scores), msg=str(list(zip(variants, scores))))
-
-        content = [_non_ws_surfaces(self.tokenizer_obj.tokenize(v)) for v in variants]
-        self.assertTrue(all(s == content[0] for s in content), msg=str(list(zip(variants, content))))
+        self._assert_variants_equivalent(variants)
 
     def test_stress_random_whitespace_separators(self):
         random.seed(0)
@@ -216,17 +249,26 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
         seps = [" ", "  ", "\t", "\n", "　", " \t "]
 
         baseline_text = " ".join(parts)
-        baseline_tokens = _non_ws_surfaces(self.tokenizer_obj.tokenize(baseline_text))
-        baseline_score = self._bridged(baseline_text)
+        tokenize = self.tokenizer_obj.tokenize
+        baseline_ms = tokenize(baseline_text)
+        baseline_tokens = _non_ws_surfaces(baseline_ms)
+        baseline_score = baseline_ms.get_internal_cost_whitespace_bridged()
 
-        for _ in range(100):
-            text = parts[0] + random.choice(seps) + parts[1] + random.choice(seps) + parts[2]
-            ms = self.tokenizer_obj.tokenize(text)
+        idx = random.choices(range(len(seps)), k=200)
+        texts = [
+            parts[0] + seps[a] + parts[1] + seps[b] + parts[2]
+            for a, b in zip(idx[::2], idx[1::2])
+        ]
+        ms = None
+        for text in texts:
+            # reuse one MorphemeList for every iteration
+            ms = tokenize(text, out=ms)
             self.assertEqual(baseline_tokens, _non_ws_surfaces(ms), msg=text)
             self.assertEqual(baseline_score, ms.get_internal_cost_whitespace_bridged(), msg=text)
 
     def test_japanese_phrase_readability_cases(self):
         # Sanity checks for common Japanese phrases with inserted spaces.
+        tokenize = self.tokenizer_obj.tokenize
         cases = [
             ("私は東京大学へ行く", "私は 東京 大学 へ 行く"),
             ("すもももももももものうち", "すもも も もも も ももの うち"),
@@ -234,8 +276,8 @@ class TestWhitespaceBridgeCost(unittest.TestCase):
         ]
         for compact, spaced in cases:
             with self.subTest(compact=compact, spaced=spaced):
-                compact_non_ws = _non_ws_surfaces(self.tokenizer_obj.tokenize(compact))
-                spaced_non_ws = _non_ws_surfaces(self.tokenizer_obj.tokenize(spaced))
+                compact_non_ws = _non_ws_surfaces(tokenize(compact))
+                spaced_non_ws = _non_ws_surfaces(tokenize(spaced))
                 # We expect same visible token sequence except for explicit spaces.
                 self.assertEqual(compact_non_ws, spaced_non_ws)
 
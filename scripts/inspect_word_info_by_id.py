@@ -4,24 +4,46 @@
 from __future__ import annotations
 
 import argparse
+import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 from sudachipy import Dictionary
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-WORD_MASK = (1 << 28) - 1
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Python-facing word ids use cross-lex packing: lex_id * 10**8 + row id.
+CROSS_LEX_ID_STRIDE = 100_000_000
+
+_MATCH_TEMPLATE = "[%d] token=%s word_id=%d (lex=%d, row=%d) wi.surface=%s wi.lex_id=%d"
+_SPLIT_TEMPLATE = "      - %d (lex=%d, row=%d) surface=%s lex_id=%d"
 
 
 def unpack(word_id: int) -> tuple[int, int]:
-    return (word_id >> 28) & 0xF, word_id & WORD_MASK
+    return divmod(word_id, CROSS_LEX_ID_STRIDE)
+
+
+def unpack_many(word_ids: Sequence[int]) -> tuple[Sequence[int], Sequence[int]]:
+    """Vectorized :func:`unpack`: returns (lex ids, row ids) for a batch of word ids."""
+    if np is None:
+        pairs = [unpack(w) for w in word_ids]
+        return [lid for lid, _ in pairs], [row for _, row in pairs]
+    return np.divmod(np.asarray(word_ids, dtype=np.int64), CROSS_LEX_ID_STRIDE)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("surface", nargs="?", default="東京府")
+    parser.add_argument("surface", nargs="*", default=["東京府"])
     parser.add_argument(
         "--resource-dir",
-        default=str(Path(__file__).resolve().parents[1] / "python" / "tests" / "resources"),
+        type=Path,
+        default=REPO_ROOT / "python" / "tests" / "resources",
     )
     parser.add_argument(
         "--config",
@@ -30,31 +52,31 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    resource_dir = Path(args.resource_dir)
+    resource_dir = args.resource_dir
     config_path = Path(args.config) if args.config else (resource_dir / "sudachi.json")
 
+    # Load the dictionary once and inspect every requested surface with it.
     dic = Dictionary(str(config_path), resource_dir=str(resource_dir))
-    out = dic.lookup(args.surface)
-
-    print(f"surface={args.surface!r} matches={len(out)}")
-    for i, m in enumerate(out):
-        wid = m.word_id()
-        did, lid = unpack(wid)
-        wi = dic.word_info(wid)
-        print(
-            f"[{i}] token={m.surface()} word_id={wid} (dic={did}, lex={lid}) "
-            f"wi.surface={wi.surface} wi.dictionary_id={wi.dictionary_id}"
-        )
-
-        if wi.a_unit_split:
-            print("    A splits:")
-            for swid in wi.a_unit_split:
-                sdid, slid = unpack(swid)
-                swi = dic.word_info(swid)
-                print(
-                    f"      - {swid} (dic={sdid}, lex={slid}) surface={swi.surface} "
-                    f"dictionary_id={swi.dictionary_id}"
-                )
+    # Dictionary has no batch word_info call; bind the lookup once instead.
+    word_info = dic.word_info
+    for surface in args.surface:
+        out = dic.lookup(surface)
+
+        # Collect the report for this surface and write it in one call.
+        lines = [f"surface={surface!r} matches={len(out)}"]
+        for i, m in enumerate(out):
+            wid = m.word_id()
+            lid, row = unpack(wid)
+            wi = word_info(wid)
+            lines.append(_MATCH_TEMPLATE % (i, m.surface(), wid, lid, row, wi.surface, wi.lex_id))
+
+            if wi.a_unit_split:
+                lines.append("    A splits:")
+                split_lids, split_rows = unpack_many(wi.a_unit_split)
+                for swid, slid, srow in zip(wi.a_unit_split, split_lids, split_rows):
+                    swi = word_info(swid)
+                    lines.append(_SPLIT_TEMPLATE % (swid, slid, srow, swi.surface, swi.lex_id))
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":